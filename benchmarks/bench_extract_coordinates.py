@@ -0,0 +1,73 @@
+"""Microbenchmark: previous extractor vs precompiled patterns vs batch
+
+Usage: python benchmarks/bench_extract_coordinates.py [rows]
+"""
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import scrapper
+
+
+def previous_extract_coordinates(url):
+    """The extractor before precompiled patterns: re.search on each pattern string"""
+    url = unquote(url)
+    
+    for pattern in scrapper.COORDINATE_FORMATS:
+        match = re.search(pattern, url)
+        if match:
+            lat, lng = float(match.group(1)), float(match.group(2))
+            if scrapper._valid_coordinates(lat, lng):
+                return lat, lng
+    
+    return scrapper._coordinates_from_query(url)
+
+
+def realistic_urls(count, seed=3):
+    """Half place/@...!3d...!4d links, half destination= direction links"""
+    rng = random.Random(seed)
+    urls = []
+    for i in range(count):
+        lat, lng = f"{rng.uniform(24.7, 25.1):.7f}", f"{rng.uniform(66.9, 67.3):.7f}"
+        if i % 2:
+            urls.append(f"https://www.google.com/maps/dir/?api=1&destination={lat}%2C{lng}&travelmode=driving")
+        else:
+            urls.append(f"https://www.google.com/maps/place/Plot+B-157,+Block+I+North+Nazimabad,+Karachi/"
+                        f"@{lat},{lng},17z/data=!3m1!4b1!4m6!3m5!1s0x3eb33f0b1c5b2c3d:0x1234abcd"
+                        f"!8m2!3d{lat}!4d{lng}!16s%2Fg%2F11abcdefg?entry=ttu")
+    return urls
+
+
+def best_of(runs, func):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    urls = realistic_urls(rows)
+    series = pd.Series(urls)
+    
+    previous = best_of(15, lambda: [previous_extract_coordinates(url) for url in urls])
+    current = best_of(15, lambda: [scrapper.extract_coordinates(url) for url in urls])
+    batch = best_of(15, lambda: scrapper.extract_coordinates_series(series))
+    
+    print(f"{rows} URLs, best of 15 runs")
+    print(f"previous extractor:   {previous:.3f}s")
+    print(f"precompiled patterns: {current:.3f}s ({previous / current:.2f}x)")
+    print(f"batch (Series):       {batch:.3f}s ({previous / batch:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
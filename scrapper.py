@@ -1,27 +1,342 @@
-import pandas as pd
+# Heavy dependencies (pandas, selenium) are imported inside the functions that
+# need them so the command line starts fast for tasks that never open a browser
+import argparse
 import time
 import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.action_chains import ActionChains
 import json
-from bs4 import BeautifulSoup, Tag, NavigableString
-from urllib.parse import unquote, urlparse, parse_qs
+import math
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from urllib.parse import quote, unquote, urlparse, parse_qs
 import os
+import sys
+
+DEFAULT_CITY = "Karachi-30"
+PLOTFINDER_URL = "https://www.zameen.com/plotfinder/{city}/"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# JSON endpoints the plot finder page is expected to call behind the scenes, used
+# by the experimental HTTP engine. Paths are relative to HTTP_API_BASE; pass
+# endpoints= to override them.
+# NOTE: these paths and the response shape parsed by ZameenHttpScraper are guesses
+# that have not been checked against live traffic. The engine is tested only with
+# the hand-written responses in tests/fixtures/plotfinder/synthetic_responses.json;
+# replace paths and fixtures together with captures from the browser's network tab.
+#
+# Response shape:
+#   area_search, plot_search: {"results": [{"id": ..., "title": ..., ...}, ...]}
+#       plot_search results may carry top-level "latitude"/"longitude"
+#   plot_detail: {"id": ..., "latitude": ..., "longitude": ...}
+HTTP_API_BASE = "https://www.zameen.com"
+HTTP_ENDPOINTS = {
+    'area_search': "/api/plotFinder/search/?city={city}&q={query}",         # Column B autocomplete
+    'plot_search': "/api/plotFinder/plots/?area={area_id}&q={query}",       # Column A autocomplete
+    'plot_detail': "/api/plotFinder/plot/{plot_id}/",                       # Plot details with coordinates
+}
+
+# Rough per-row cost used by the planner, based on the waits in the Selenium flow
+TYPING_SECONDS_PER_CHAR = 0.1   # _type_and_select_suggestion types one char per 0.1s
+SUGGESTION_WAIT_SECONDS = 5     # _type_and_select_suggestion's default wait_time
+ROW_OVERHEAD_SECONDS = 8.0      # Page loads, clicks and the Google Maps redirect
+HTTP_REQUEST_SECONDS = 0.5      # One JSON request of the HTTP engine
+HTTP_REQUESTS_PER_ROW = 2       # Plot search and plot details; area search is cached per area
+
+
+def _cell_key(value):
+    """Normalized text of an area/location cell, for comparing rows across runs"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return " ".join(str(value).lower().split())
+
+
+def col_to_index(col_letter):
+    """Convert an Excel column letter to a zero-based column index"""
+    return ord(col_letter.upper()) - ord('A')
+
+
+def default_output_file(file_path, output_file=None):
+    """Name of the workbook process_excel_file writes its final results to"""
+    return output_file or file_path.replace('.xlsx', '_with_coordinates.xlsx')
+
+
+# Google Maps URL formats holding coordinates, in order of preference
+COORDINATE_FORMATS = [
+    r'@(-?\d+\.\d+),(-?\d+\.\d+)',  # @lat,lng
+    r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)',  # !3dlat!4dlng
+    r'destination=(-?\d+\.\d+)(?:,|%2C|%2c)(-?\d+\.\d+)',  # destination=lat,lng
+    r'q=(-?\d+\.\d+)(?:,|%2C|%2c)(-?\d+\.\d+)',  # q=lat,lng
+    r'place/(-?\d+\.\d+),(-?\d+\.\d+)',  # place/lat,lng
+    r'll=(-?\d+\.\d+),(-?\d+\.\d+)',  # ll=lat,lng
+]
+
+# Precompiled once; searching the formats one by one lets the regex engine use
+# each format's literal prefix (@, !3d, destination=, ...) to skip ahead, which
+# measured faster than a single combined alternation
+COORDINATE_PATTERNS = [re.compile(fmt) for fmt in COORDINATE_FORMATS]
+
+
+def _valid_coordinates(lat, lng):
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def _coordinates_from_query(url):
+    """Fallback: read lat,lng from the q, destination or ll query parameters"""
+    params = parse_qs(urlparse(url).query)
+    
+    for key in ['q', 'destination', 'll']:
+        if key in params:
+            parts = params[key][0].split(',')
+            if len(parts) >= 2:
+                try:
+                    lat, lng = float(parts[0]), float(parts[1])
+                except ValueError:
+                    continue
+                if _valid_coordinates(lat, lng):
+                    return lat, lng
+    
+    return None, None
+
+
+def extract_coordinates(url):
+    """Extract (latitude, longitude) from a Google Maps URL, or (None, None)"""
+    url = unquote(url)
+    
+    # Formats in order of preference; the first valid match wins
+    for pattern in COORDINATE_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            lat, lng = float(match.group(1)), float(match.group(2))
+            if _valid_coordinates(lat, lng):
+                return lat, lng
+    
+    return _coordinates_from_query(url)
+
+
+def extract_coordinates_series(urls):
+    """Extract coordinates for many URLs at once
+    
+    Each distinct URL is parsed once, so this only helps when URLs repeat
+    across rows; on a column of unique URLs it is slightly slower than calling
+    extract_coordinates per row (0.91x on 20k unique URLs).
+    
+    Args:
+        urls: pandas Series (or iterable) of Google Maps URLs; non-strings are skipped
+    
+    Returns:
+        DataFrame with 'latitude' and 'longitude' columns on the same index,
+        NaN where no coordinates were found
+    """
+    import pandas as pd
+    
+    urls = pd.Series(urls)
+    values = urls.tolist()
+    parsed = {url: extract_coordinates(url) for url in set(values) if isinstance(url, str)}
+    coords = [parsed[url] if isinstance(url, str) else (None, None) for url in values]
+    return pd.DataFrame(coords, index=urls.index, columns=['latitude', 'longitude'], dtype=float)
+
+
+def reextract_excel_file(file_path, lat_col="C", lng_col="D", url_col="E",
+                         output_file=None, has_header=False):
+    """Re-derive latitude/longitude from stored Google Maps URLs, without a browser
+    
+    Rows whose URL yields coordinates get them written to lat_col/lng_col; rows
+    without a usable URL keep their current values.
+    """
+    import pandas as pd
+    
+    output_file = output_file or file_path.replace('.xlsx', '_reextracted.xlsx')
+    df = pd.read_excel(file_path, header=0 if has_header else None)
+    print(f"Loaded {len(df)} rows from: {file_path}")
+    
+    lat_idx = col_to_index(lat_col)
+    lng_idx = col_to_index(lng_col)
+    url_idx = col_to_index(url_col)
+    while len(df.columns) <= max(lat_idx, lng_idx, url_idx):
+        df[len(df.columns)] = None
+    
+    urls = df.iloc[:, url_idx]
+    coords = extract_coordinates_series(urls)
+    
+    found = coords['latitude'].notna()
+    old_lat = pd.to_numeric(df.iloc[:, lat_idx], errors='coerce')
+    old_lng = pd.to_numeric(df.iloc[:, lng_idx], errors='coerce')
+    changed = found & ((old_lat != coords['latitude']) | (old_lng != coords['longitude']))
+    
+    for i in (lat_idx, lng_idx):
+        df[df.columns[i]] = df.iloc[:, i].astype(object)
+    df.loc[found, df.columns[lat_idx]] = coords.loc[found, 'latitude']
+    df.loc[found, df.columns[lng_idx]] = coords.loc[found, 'longitude']
+    df.to_excel(output_file, index=False, header=has_header)
+    
+    with_url = int(urls.map(lambda value: isinstance(value, str) and value != "N/A").sum())
+    print(f"URLs: {with_url}, coordinates found: {int(found.sum())}, changed: {int(changed.sum())}")
+    print(f"Results saved to: {output_file}")
+    
+    return coords
+
+
+class ScrapeCancelled(Exception):
+    """Raised inside an attempt that lost to a hedged duplicate"""
+
+
+class AreaIndex:
+    """Persistent map from normalized area names (column B) to plot finder URLs
+    
+    Filled in as the first search bar's suggestion is clicked, so later rows for
+    the same area can open its map view directly. Entries are kept per city as
+    {"url": ..., "failures": ..., "last_failure": ...}. An area whose URL did not
+    work as a shortcut loses its URL and is indexed again on the next search;
+    after max_failures failures within retry_after_days it is blocked until
+    retry_after_days have passed since its last failure.
+    """
+    
+    def __init__(self, path="area_index.json", max_failures=3, retry_after_days=7):
+        self.path = path
+        self.max_failures = max_failures
+        self.retry_after_days = retry_after_days
+        self.entries = {}  # city -> {normalized area -> entry}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entries = json.load(f)
+                self.entries = {
+                    city: {key: self._load_entry(entry) for key, entry in areas.items()}
+                    for city, areas in entries.items()
+                }
+                print(f"Loaded area index with {len(self)} entries from: {path}")
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"Error loading area index {path}: {e}")
+    
+    @staticmethod
+    def _load_entry(entry):
+        """Read an entry, including the older url-or-null format"""
+        if isinstance(entry, dict):
+            return entry
+        if entry is None:
+            # Failed once at an unknown time: free to be indexed again
+            return {"url": None, "failures": 1, "last_failure": None}
+        return {"url": entry}
+    
+    def __len__(self):
+        return sum(1 for areas in self.entries.values() for entry in areas.values() if entry.get("url"))
+    
+    @staticmethod
+    def normalize(area):
+        """Normalize an area name so spelling variants share one entry"""
+        return " ".join(str(area).lower().split())
+    
+    def _recent_failure(self, entry):
+        """True if the entry's last failure is within retry_after_days"""
+        last_failure = _parse_timestamp(entry.get("last_failure"))
+        return last_failure is not None and datetime.now() - last_failure < timedelta(days=self.retry_after_days)
+    
+    def blocked(self, city, area):
+        """True if the area failed too often recently to be indexed"""
+        entry = self.entries.get(city, {}).get(self.normalize(area))
+        return (entry is not None and entry.get("failures", 0) >= self.max_failures and
+                self._recent_failure(entry))
+    
+    def get(self, city, area):
+        """Return the indexed URL for an area, or None"""
+        entry = self.entries.get(city, {}).get(self.normalize(area))
+        return entry.get("url") if entry else None
+    
+    def add(self, city, area, url):
+        """Record the URL an area leads to and persist the index"""
+        key = self.normalize(area)
+        with self._lock:
+            entry = self.entries.get(city, {}).get(key)
+            if entry is not None and (entry.get("url") == url or self.blocked(city, area)):
+                return
+            self.entries.setdefault(city, {})[key] = {**(entry or {}), "url": url}
+            self.save()
+        print(f"Indexed area '{key}' -> {url}")
+    
+    def remove(self, city, area):
+        """Drop the URL of an area that did not work as a shortcut and count the failure
+        
+        Failures older than retry_after_days are forgotten, so only repeated
+        recent failures block the area.
+        """
+        key = self.normalize(area)
+        with self._lock:
+            entry = self.entries.setdefault(city, {}).get(key) or {}
+            failures = entry.get("failures", 0) + 1 if self._recent_failure(entry) else 1
+            self.entries[city][key] = {
+                "url": None,
+                "failures": failures,
+                "last_failure": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self.save()
+        if failures >= self.max_failures:
+            print(f"Removed area '{key}' from index, blocked for {self.retry_after_days} days "
+                  f"after {failures} failures")
+        else:
+            print(f"Removed area '{key}' from index (failure {failures} of {self.max_failures})")
+    
+    def save(self):
+        """Write the index to disk atomically"""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving area index {self.path}: {e}")
+
 
 class ZameenScraper:
-    def __init__(self, headless=False):
-        """Initialize the Zameen scraper with Chrome driver"""
+    def __init__(self, headless=False, city=DEFAULT_CITY, area_index=None):
+        """Initialize the Zameen scraper with Chrome driver
+        
+        Args:
+            city: Plot finder city path, e.g. "Karachi-30"
+            area_index: Optional AreaIndex used to skip the first search bar
+        """
         self.driver = None
+        self.headless = headless
+        self.city = city
+        self.plotfinder_url = PLOTFINDER_URL.format(city=city)
+        self.area_index = area_index
+        self.cancel_event = None  # Set by HedgedScheduler when another attempt wins
         self.setup_driver(headless)
+    
+    def _spawn_session(self):
+        """Create another scraper with the same settings (used for parallel workers)"""
+        return ZameenScraper(headless=self.headless, city=self.city, area_index=self.area_index)
+    
+    def _check_cancelled(self):
+        """Abort the current scrape, closing its tabs, if another attempt already finished this row"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self._cleanup_tabs()
+            raise ScrapeCancelled("Cancelled: another attempt already finished this row")
+    
+    def _sleep(self, seconds):
+        """time.sleep that wakes up as soon as this attempt is cancelled"""
+        if self.cancel_event is None:
+            time.sleep(seconds)
+        elif self.cancel_event.wait(seconds):
+            self._check_cancelled()
+    
+    def _cleanup_tabs(self):
+        """Close every tab except the first one and switch back to it"""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+        except Exception as e:
+            print(f"Error cleaning up tabs: {e}")
         
     def setup_driver(self, headless=False):
         """Setup Chrome driver with appropriate options"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         chrome_options = Options()
         if headless:
             chrome_options.add_argument("--headless")
@@ -32,7 +347,7 @@ class ZameenScraper:
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
         
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
@@ -45,16 +360,22 @@ class ZameenScraper:
     
     def _wait_for_page_load(self, timeout=10):
         """Wait for page to load completely"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
         try:
             WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+                lambda driver: self._check_cancelled() or
+                driver.execute_script("return document.readyState") == "complete"
             )
-            time.sleep(1)  # Additional wait for dynamic content
+            self._sleep(1)  # Additional wait for dynamic content
         except TimeoutException:
             print("Page load timeout, continuing anyway...")
     
     def _find_search_inputs(self):
         """Find search input fields on the page"""
+        from selenium.webdriver.common.by import By
+        
         try:
             # Wait for page to load
             self._wait_for_page_load()
@@ -94,12 +415,16 @@ class ZameenScraper:
             print(f"Total unique inputs found: {len(unique_inputs)}")
             return unique_inputs[:2] if len(unique_inputs) >= 2 else unique_inputs
             
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             print(f"Error finding search inputs: {e}")
             return []
 
     def _type_and_select_suggestion(self, input_element, text_to_type, wait_time=5):
         """Type text and select the FIRST suggestion that appears"""
+        from selenium.webdriver.common.by import By
+        
         try:
             print(f"Typing '{text_to_type}' in input field...")
             
@@ -110,11 +435,11 @@ class ZameenScraper:
             # Type character by character for better detection
             for char in text_to_type:
                 input_element.send_keys(char)
-                time.sleep(0.1)
+                self._sleep(0.1)
             
             # Wait longer for suggestions to appear
             print(f"Waiting {wait_time} seconds for suggestions...")
-            time.sleep(wait_time)
+            self._sleep(wait_time)
             
             # Try multiple suggestion selectors
             suggestion_selectors = [
@@ -233,12 +558,17 @@ class ZameenScraper:
                 print(f"No suggestions found or clickable for '{text_to_type}'")
                 return False
             
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             print(f"Error in _type_and_select_suggestion: {e}")
             return False
 
     def _find_and_click_search_result(self, timeout=15):
         """Find and click on the first search result"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.action_chains import ActionChains
+        
         try:
             print("Looking for search results...")
             time.sleep(0.1)  # Wait for results to load
@@ -298,6 +628,8 @@ class ZameenScraper:
 
     def _find_and_click_location_button(self, timeout=10):
         """Find and click location/navigate button"""
+        from selenium.webdriver.common.by import By
+        
         try:
             print("Looking for location/navigate button...")
             time.sleep(0.1)
@@ -373,51 +705,96 @@ class ZameenScraper:
     def _extract_coordinates_from_url(self, url):
         """Extract latitude and longitude from Google Maps URL"""
         try:
-            url = unquote(url)
-            print(f"Extracting coordinates from URL: {url[:100]}...")
-            
-            # Multiple regex patterns for different URL formats
-            patterns = [
-                r'@(-?\d+\.\d+),(-?\d+\.\d+)',  # @lat,lng
-                r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)',  # !3dlat!4dlng
-                r'destination=(-?\d+\.\d+)(?:,|%2C|%2c)(-?\d+\.\d+)',  # destination=lat,lng
-                r'q=(-?\d+\.\d+)(?:,|%2C|%2c)(-?\d+\.\d+)',  # q=lat,lng
-                r'place/(-?\d+\.\d+),(-?\d+\.\d+)',  # place/lat,lng
-                r'll=(-?\d+\.\d+),(-?\d+\.\d+)',  # ll=lat,lng
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, url)
-                if match:
-                    lat, lng = float(match.group(1)), float(match.group(2))
-                    if -90 <= lat <= 90 and -180 <= lng <= 180:
-                        print(f"Extracted coordinates: {lat}, {lng}")
-                        return lat, lng
-            
-            # Try parsing query parameters
-            parsed = urlparse(url)
-            params = parse_qs(parsed.query)
-            
-            for key in ['q', 'destination', 'll']:
-                if key in params:
-                    value = params[key][0]
-                    parts = value.split(',')
-                    if len(parts) >= 2:
-                        try:
-                            lat, lng = float(parts[0]), float(parts[1])
-                            if -90 <= lat <= 90 and -180 <= lng <= 180:
-                                print(f"Extracted coordinates from {key}: {lat}, {lng}")
-                                return lat, lng
-                        except ValueError:
-                            continue
-            
-            print("Could not extract coordinates from URL")
-            return None, None
+            print(f"Extracting coordinates from URL: {unquote(url)[:100]}...")
+            lat, lng = extract_coordinates(url)
+            if lat is None:
+                print("Could not extract coordinates from URL")
+            else:
+                print(f"Extracted coordinates: {lat}, {lng}")
+            return lat, lng
             
         except Exception as e:
             print(f"Error extracting coordinates: {e}")
             return None, None
 
+    def _open_area_with_search(self, column_b_value):
+        """Open the plot finder and pick the first suggestion for the area in the FIRST search bar"""
+        # Navigate to Zameen plot finder
+        print("Opening Zameen plot finder...")
+        self.driver.get(self.plotfinder_url)
+        self._wait_for_page_load()
+        self._check_cancelled()
+        
+        # Take a screenshot for debugging
+        try:
+            self.driver.save_screenshot(f"step1_initial_page.png")
+            print("Screenshot saved: step1_initial_page.png")
+        except:
+            pass
+        
+        # STEP 1: Find the FIRST (and initially ONLY) search input
+        inputs = self._find_search_inputs()
+        if len(inputs) < 1:
+            raise Exception("No search input found on the page")
+        
+        first_input = inputs[0]
+        print(f"Found first search input with placeholder: '{first_input.get_attribute('placeholder')}'")
+        
+        # STEP 2: Type Column B value in the FIRST search bar and select suggestion
+        print(f"Step 1: Typing Column B value ('{column_b_value}') in the FIRST search bar...")
+        if not self._type_and_select_suggestion(first_input, column_b_value):
+            raise Exception(f"Failed to select suggestion for Column B: {column_b_value}")
+        
+        return first_input
+
+    def _find_second_search_input(self, first_input, max_attempts=3):
+        """Find the SECOND search bar that appears once an area is selected"""
+        from selenium.webdriver.common.by import By
+        
+        # STEP 4: Find the NEW second search bar that should have appeared
+        print("Step 3: Looking for the NEW second search bar...")
+        
+        second_input = None
+        
+        for attempt in range(max_attempts):
+            print(f"Attempt {attempt + 1} to find second search bar...")
+            
+            # Get all current inputs
+            current_inputs = self._find_search_inputs()
+            
+            # Look for inputs that are different from the first one
+            for inp in current_inputs:
+                if inp != first_input and inp.is_displayed():
+                    second_input = inp
+                    print(f"Found second input with placeholder: '{inp.get_attribute('placeholder')}'")
+                    break
+            
+            # If not found, try broader search
+            if not second_input:
+                all_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input")
+                for inp in all_inputs:
+                    if inp != first_input and inp.is_displayed():
+                        input_type = inp.get_attribute('type') or ""
+                        placeholder = inp.get_attribute('placeholder') or ""
+                        # Check if it looks like a search input
+                        if (input_type in ['text', 'search', ''] and 
+                            ('search' in placeholder.lower() or 
+                             'location' in placeholder.lower() or 
+                             'area' in placeholder.lower() or 
+                             placeholder == "")):
+                            second_input = inp
+                            print(f"Found second input (broader search) with placeholder: '{placeholder}'")
+                            break
+            
+            if second_input:
+                break
+                
+            if attempt < max_attempts - 1:
+                print(f"Second input not found, waiting 2 more seconds...")
+                time.sleep(0.1)
+        
+        return second_input
+
     def scrape_single_location(self, column_b_value, column_a_value):
         """Scrape coordinates for a single location
         
@@ -425,83 +802,43 @@ class ZameenScraper:
             column_b_value: Value from Excel column B (typed in FIRST search bar)
             column_a_value: Value from Excel column A (typed in SECOND search bar)
         """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
         try:
             print(f"\n=== Scraping: Column B (1st search)='{column_b_value}', Column A (2nd search)='{column_a_value}' ===")
             
-            # Navigate to Zameen plot finder
-            print("Opening Zameen plot finder...")
-            self.driver.get("https://www.zameen.com/plotfinder/Karachi-30/")
-            self._wait_for_page_load()
-            
-            # Take a screenshot for debugging
-            try:
-                self.driver.save_screenshot(f"step1_initial_page.png")
-                print("Screenshot saved: step1_initial_page.png")
-            except:
-                pass
-            
-            # STEP 1: Find the FIRST (and initially ONLY) search input
-            inputs = self._find_search_inputs()
-            if len(inputs) < 1:
-                raise Exception("No search input found on the page")
-            
-            first_input = inputs[0]
-            print(f"Found first search input with placeholder: '{first_input.get_attribute('placeholder')}'")
-            
-            # STEP 2: Type Column B value in the FIRST search bar and select suggestion
-            print(f"Step 1: Typing Column B value ('{column_b_value}') in the FIRST search bar...")
-            if not self._type_and_select_suggestion(first_input, column_b_value):
-                raise Exception(f"Failed to select suggestion for Column B: {column_b_value}")
-            
-            # STEP 3: Wait for the SECOND search bar to appear after clicking first suggestion
-            print("Step 2: Waiting for SECOND search bar to appear after first selection...")
-            time.sleep(0.1)  # Wait for second input to appear
-            
-            # STEP 4: Find the NEW second search bar that should have appeared
-            print("Step 3: Looking for the NEW second search bar...")
-            
             second_input = None
-            max_attempts = 3
-            
-            for attempt in range(max_attempts):
-                print(f"Attempt {attempt + 1} to find second search bar...")
+            indexed_url = self.area_index.get(self.city, column_b_value) if self.area_index else None
+            if indexed_url:
+                # Skip the first search bar and open the area's map view directly
+                print(f"Area '{column_b_value}' found in index, opening: {indexed_url}")
+                self.driver.get(indexed_url)
+                self._wait_for_page_load()
+                self._check_cancelled()
                 
-                # Get all current inputs
-                current_inputs = self._find_search_inputs()
+                inputs = self._find_search_inputs()
+                if inputs:
+                    second_input = self._find_second_search_input(inputs[0])
+                if not second_input:
+                    print("Second search bar not found on indexed page, using the FIRST search bar instead")
+                    self.area_index.remove(self.city, column_b_value)
+            
+            if not second_input:
+                first_input = self._open_area_with_search(column_b_value)
+                self._check_cancelled()
                 
-                # Look for inputs that are different from the first one
-                for inp in current_inputs:
-                    if inp != first_input and inp.is_displayed():
-                        second_input = inp
-                        print(f"Found second input with placeholder: '{inp.get_attribute('placeholder')}'")
-                        break
+                # STEP 3: Wait for the SECOND search bar to appear after clicking first suggestion
+                print("Step 2: Waiting for SECOND search bar to appear after first selection...")
+                time.sleep(0.1)  # Wait for second input to appear
                 
-                # If not found, try broader search
+                second_input = self._find_second_search_input(first_input)
                 if not second_input:
-                    all_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input")
-                    for inp in all_inputs:
-                        if inp != first_input and inp.is_displayed():
-                            input_type = inp.get_attribute('type') or ""
-                            placeholder = inp.get_attribute('placeholder') or ""
-                            # Check if it looks like a search input
-                            if (input_type in ['text', 'search', ''] and 
-                                ('search' in placeholder.lower() or 
-                                 'location' in placeholder.lower() or 
-                                 'area' in placeholder.lower() or 
-                                 placeholder == "")):
-                                second_input = inp
-                                print(f"Found second input (broader search) with placeholder: '{placeholder}'")
-                                break
+                    raise Exception("Second search bar did not appear after selecting first suggestion")
                 
-                if second_input:
-                    break
-                    
-                if attempt < max_attempts - 1:
-                    print(f"Second input not found, waiting 2 more seconds...")
-                    time.sleep(0.1)
-            
-            if not second_input:
-                raise Exception("Second search bar did not appear after selecting first suggestion")
+                # Remember where the first suggestion led so later rows can go straight there
+                if self.area_index is not None and self.driver.current_url.rstrip('/') != self.plotfinder_url.rstrip('/'):
+                    self.area_index.add(self.city, column_b_value, self.driver.current_url)
             
             # STEP 5: Type Column A value in the SECOND search bar and select suggestion
             print(f"Step 4: Typing Column A value ('{column_a_value}') in the SECOND search bar...")
@@ -509,6 +846,7 @@ class ZameenScraper:
                 raise Exception(f"Failed to select suggestion for Column A: {column_a_value}")
             
             time.sleep(0.1)  # Wait for search results
+            self._check_cancelled()
             
             # Take screenshot after search
             try:
@@ -535,7 +873,8 @@ class ZameenScraper:
             # Wait for Google Maps to load
             try:
                 WebDriverWait(self.driver, 15).until(
-                    lambda d: "google.com/maps" in d.current_url.lower() or "maps.google" in d.current_url.lower()
+                    lambda d: self._check_cancelled() or
+                    "google.com/maps" in d.current_url.lower() or "maps.google" in d.current_url.lower()
                 )
             except TimeoutException:
                 print("Timeout waiting for Google Maps, checking current URL anyway...")
@@ -578,72 +917,120 @@ class ZameenScraper:
 
     def process_excel_file(self, file_path, area_col="B", location_col="A", 
                           lat_col="C", lng_col="D", url_col="E", 
-                          output_file=None, has_header=False):
+                          output_file=None, has_header=False,
+                          incremental=False, stale_after_days=None, timestamp_col=None,
+                          workers=1, hedge_percentile=None):
         """Process Excel file with locations
         
         Args:
             area_col: Column with area/society names (typed in FIRST search bar)
             location_col: Column with specific locations (typed in SECOND search bar)
+            incremental: Merge in the existing output file's results and only scrape
+                rows that have no coordinates yet (empty, "Location not found",
+                rows added to the input since the last run, ...)
+            stale_after_days: With incremental, also re-scrape rows whose scrape
+                time in timestamp_col is missing or older than this many days
+            timestamp_col: Column where the scrape time of each row is written
+            workers: Number of browser sessions scraping rows in parallel
+            hedge_percentile: With workers > 1, start a duplicate attempt for rows
+                running longer than this percentile of observed row latency
         """
+        import pandas as pd
+        
+        if stale_after_days is not None and not timestamp_col:
+            raise ValueError("stale_after_days needs timestamp_col to know when rows were scraped")
+        
         try:
+            final_output = default_output_file(file_path, output_file)
+            
             print(f"Processing Excel file: {file_path}")
             
             # Read Excel file
             df = pd.read_excel(file_path, header=0 if has_header else None)
             print(f"Loaded {len(df)} rows from Excel file")
             
-            # Convert column letters to indices
-            def col_to_index(col_letter):
-                return ord(col_letter.upper()) - ord('A')
+            # In incremental mode pick up where the previous run left off
+            previous = None
+            if incremental and os.path.exists(final_output) and os.path.abspath(final_output) != os.path.abspath(file_path):
+                previous = pd.read_excel(final_output, header=0 if has_header else None)
+                print(f"Incremental mode: merging {len(previous)} rows of previous output {final_output}")
             
+            # Convert column letters to indices
             area_idx = col_to_index(area_col)
             location_idx = col_to_index(location_col)
             lat_idx = col_to_index(lat_col)
             lng_idx = col_to_index(lng_col)
             url_idx = col_to_index(url_col)
+            ts_idx = col_to_index(timestamp_col) if timestamp_col else None
+            output_idxs = [i for i in (lat_idx, lng_idx, url_idx, ts_idx) if i is not None]
             
             # Ensure dataframe has enough columns
-            max_col_idx = max(area_idx, location_idx, lat_idx, lng_idx, url_idx)
+            input_width = len(df.columns)
+            max_col_idx = max(area_idx, location_idx, *output_idxs)
             while len(df.columns) <= max_col_idx:
                 df[len(df.columns)] = None
             
-            results = []
-            successful = 0
-            failed = 0
+            # Output columns hold both numbers and status strings
+            for i in output_idxs:
+                df[df.columns[i]] = df.iloc[:, i].astype(object)
             
-            for idx, row in df.iterrows():
-                print(f"\n{'='*50}")
-                print(f"Processing row {idx + 1} of {len(df)}")
+            if previous is not None:
+                # Reuse a previous result only where the row still holds the same
+                # area and location; inserted, deleted or edited rows stay pending
+                def previous_cell(pos, idx):
+                    return previous.iat[pos, idx] if pos < len(previous) and idx < len(previous.columns) else None
                 
-                # Get area and location values (CORRECTED ORDER)
-                area_val = row.iloc[area_idx] if pd.notna(row.iloc[area_idx]) else ""        # Column B - First search
-                location_val = row.iloc[location_idx] if pd.notna(row.iloc[location_idx]) else ""  # Column A - Second search
-                
-                print(f"Column B (First search): '{area_val}'")
-                print(f"Column A (Second search): '{location_val}'")
-                
-                # Skip empty rows
-                if not area_val and not location_val:
-                    print("Skipping empty row")
-                    df.iloc[idx, lat_idx] = "Empty row"
-                    df.iloc[idx, lng_idx] = "Empty row"
-                    df.iloc[idx, url_idx] = "N/A"
-                    continue
+                matches = [
+                    pos < len(previous) and
+                    _cell_key(previous_cell(pos, area_idx)) == _cell_key(df.iat[pos, area_idx]) and
+                    _cell_key(previous_cell(pos, location_idx)) == _cell_key(df.iat[pos, location_idx])
+                    for pos in range(len(df))
+                ]
+                print(f"Incremental mode: {len(df) - sum(matches)} rows have no matching previous row")
                 
-                # Scrape this location (B first, then A)
-                result = self.scrape_single_location(str(area_val), str(location_val))
+                # Carry the output columns plus any extra columns the previous run
+                # wrote (e.g. a timestamp column not passed this time)
+                while len(df.columns) < len(previous.columns):
+                    df[len(df.columns)] = None
+                carried = (set(output_idxs) | set(range(input_width, len(previous.columns)))) - {area_idx, location_idx}
+                for i in sorted(carried):
+                    values = [previous_cell(pos, i) if matched else None for pos, matched in enumerate(matches)]
+                    df[df.columns[i]] = pd.Series(values, index=df.index, dtype=object)
+            
+            pending = list(range(len(df)))
+            if incremental:
+                # A row is done once both coordinates are numeric; anything else
+                # ("Location not found", "Empty row", blanks) is tried again
+                done = (pd.to_numeric(df.iloc[:, lat_idx], errors='coerce').notna() &
+                        pd.to_numeric(df.iloc[:, lng_idx], errors='coerce').notna())
+                if stale_after_days is not None and ts_idx is not None:
+                    scraped_at = pd.to_datetime(df.iloc[:, ts_idx], errors='coerce')
+                    cutoff = pd.Timestamp.now() - pd.Timedelta(days=stale_after_days)
+                    done &= scraped_at.notna() & (scraped_at >= cutoff)
+                pending = [pos for pos, is_done in enumerate(done.tolist()) if not is_done]
+                print(f"Incremental mode: {len(df) - len(pending)} rows already done, "
+                      f"{len(pending)} rows to scrape")
+            
+            results = []
+            counts = {'successful': 0, 'failed': 0}
+            
+            def record_result(idx, result):
+                area_val, location_val = row_values[idx]
                 
                 # Update dataframe
                 if result['success']:
                     df.iloc[idx, lat_idx] = result['latitude']
                     df.iloc[idx, lng_idx] = result['longitude']
                     df.iloc[idx, url_idx] = result['maps_url']
-                    successful += 1
+                    counts['successful'] += 1
                 else:
                     df.iloc[idx, lat_idx] = "Location not found"
                     df.iloc[idx, lng_idx] = "Location not found"
                     df.iloc[idx, url_idx] = "N/A"
-                    failed += 1
+                    counts['failed'] += 1
+                
+                if ts_idx is not None:
+                    df.iloc[idx, ts_idx] = time.strftime("%Y-%m-%d %H:%M:%S")
                 
                 results.append({
                     'row': idx + 1,
@@ -653,25 +1040,63 @@ class ZameenScraper:
                 })
                 
                 # Save progress every 5 rows
-                if (idx + 1) % 5 == 0:
+                if len(results) % 5 == 0:
                     temp_output = output_file or file_path.replace('.xlsx', '_progress.xlsx')
                     df.to_excel(temp_output, index=False, header=has_header)
                     print(f"Progress saved to: {temp_output}")
+            
+            # Get area and location values (CORRECTED ORDER) and skip empty rows
+            row_values = {}
+            jobs = []
+            for idx in pending:
+                row = df.iloc[idx]
+                area_val = row.iloc[area_idx] if pd.notna(row.iloc[area_idx]) else ""        # Column B - First search
+                location_val = row.iloc[location_idx] if pd.notna(row.iloc[location_idx]) else ""  # Column A - Second search
                 
-                # Polite delay between requests
-                time.sleep(0.1)
+                if not area_val and not location_val:
+                    print(f"Skipping empty row {idx + 1}")
+                    df.iloc[idx, lat_idx] = "Empty row"
+                    df.iloc[idx, lng_idx] = "Empty row"
+                    df.iloc[idx, url_idx] = "N/A"
+                    continue
+                
+                row_values[idx] = (area_val, location_val)
+                jobs.append((idx, str(area_val), str(location_val)))
+            
+            if workers > 1:
+                # Extra browser sessions share the rows; slow rows get hedged
+                sessions = [self]
+                try:
+                    for _ in range(workers - 1):
+                        sessions.append(self._spawn_session())
+                    scheduler = HedgedScheduler(sessions, hedge_percentile=hedge_percentile)
+                    scheduler.run(jobs, record_result)
+                finally:
+                    for session in sessions[1:]:
+                        session.close()
+            else:
+                for idx, area_val, location_val in jobs:
+                    print(f"\n{'='*50}")
+                    print(f"Processing row {idx + 1} of {len(df)}")
+                    print(f"Column B (First search): '{area_val}'")
+                    print(f"Column A (Second search): '{location_val}'")
+                    
+                    # Scrape this location (B first, then A)
+                    record_result(idx, self.scrape_single_location(area_val, location_val))
+                    
+                    # Polite delay between requests
+                    time.sleep(0.1)
             
             # Save final results
-            final_output = output_file or file_path.replace('.xlsx', '_with_coordinates.xlsx')
             df.to_excel(final_output, index=False, header=has_header)
             
             print(f"\n{'='*50}")
             print("SCRAPING COMPLETED!")
             print(f"Final results saved to: {final_output}")
             print(f"Total processed: {len(results)}")
-            print(f"Successful: {successful}")
-            print(f"Failed: {failed}")
-            print(f"Success rate: {(successful / len(results) * 100):.1f}%" if results else "0%")
+            print(f"Successful: {counts['successful']}")
+            print(f"Failed: {counts['failed']}")
+            print(f"Success rate: {(counts['successful'] / len(results) * 100):.1f}%" if results else "0%")
             
             return pd.DataFrame(results)
             
@@ -688,47 +1113,642 @@ class ZameenScraper:
             except Exception as e:
                 print(f"Error closing browser: {e}")
 
-def main():
-    """Main function"""
-    # Configuration - UPDATE THESE PATHS AND SETTINGS
-    EXCEL_FILE_PATH = "zameen.xlsx"  # Your Excel file path
-    AREA_COLUMN = "B"        # Column B: Area/society names (FIRST search bar)
-    LOCATION_COLUMN = "A"    # Column A: Specific locations (SECOND search bar)
-    LAT_OUTPUT_COLUMN = "C"  # Where to write latitude
-    LNG_OUTPUT_COLUMN = "D"  # Where to write longitude
-    URL_OUTPUT_COLUMN = "E"  # Where to write Google Maps URL
-    OUTPUT_FILE = "addresses_with_coordinates.xlsx"       # None = auto-generate name, or specify custom path
-    HAS_HEADER = False       # True if first row contains headers
-    HEADLESS_MODE = False    # True to run without showing browser window
+
+def _first_result(payload):
+    """First item of an area_search/plot_search response, or None"""
+    results = payload.get('results') if isinstance(payload, dict) else None
+    if not isinstance(results, list):
+        raise Exception(f"Unexpected search response: {str(payload)[:100]}")
+    return results[0] if results else None
+
+
+def _own_coordinates(obj):
+    """Top-level latitude/longitude of a plot result or plot_detail response"""
+    try:
+        lat, lng = float(obj['latitude']), float(obj['longitude'])
+    except (KeyError, TypeError, ValueError):
+        return None, None
+    if not _valid_coordinates(lat, lng):
+        return None, None
+    return lat, lng
+
+
+class ZameenHttpScraper(ZameenScraper):
+    """Look up plots through the plot finder's JSON endpoints instead of Chrome
+    
+    Experimental: HTTP_ENDPOINTS and the response shape are unconfirmed, so
+    against the live site every row may end up in the Selenium fallback.
+    
+    Resolves area -> plot -> coordinates with a few small requests over a pooled
+    requests.Session (keep-alive and retries). A row is handed to the Selenium
+    flow only when the HTTP path fails; each worker session starts its own
+    fallback browser on first use. If Chrome cannot be started, the fallback is
+    switched off for every session and the row is reported as failed.
+    """
+    
+    def __init__(self, headless=False, city=DEFAULT_CITY, area_index=None,
+                 api_base=HTTP_API_BASE, endpoints=None, timeout=10, retries=2,
+                 pool_size=8, fallback=True, _shared=None):
+        """Initialize the HTTP engine (no browser is started here)
+        
+        Args:
+            api_base: Base URL of the JSON endpoints, e.g. a local stub server
+            endpoints: Overrides for HTTP_ENDPOINTS
+            timeout: Seconds per HTTP request
+            retries: Retries for connection errors and 429/5xx responses
+            pool_size: Keep-alive connections kept open (match the worker count)
+            fallback: Use the Selenium flow for rows the HTTP path cannot resolve
+        """
+        super().__init__(headless=headless, city=city, area_index=area_index)
+        self._browser = None
+        self.api_base = api_base.rstrip('/')
+        self.endpoints = {**HTTP_ENDPOINTS, **(endpoints or {})}
+        self.timeout = timeout
+        self.retries = retries
+        self.pool_size = pool_size
+        self.fallback = fallback
+        
+        # Spawned sessions share the connection pool, area ids and fallback state
+        self._owns_shared = _shared is None
+        self._shared = _shared or {
+            'session': self._build_session(pool_size, retries),
+            'area_ids': {},
+            'fallback_error': None,  # Set once Chrome failed to start
+        }
+    
+    def setup_driver(self, headless=False):
+        """No browser up front; the fallback browser is started on first use"""
+        self.driver = None
+    
+    def _spawn_session(self):
+        """Create another HTTP scraper sharing this one's connection pool"""
+        return ZameenHttpScraper(
+            headless=self.headless, city=self.city, area_index=self.area_index,
+            api_base=self.api_base, endpoints=self.endpoints, timeout=self.timeout,
+            retries=self.retries, pool_size=self.pool_size, fallback=self.fallback,
+            _shared=self._shared)
+    
+    def _cleanup_tabs(self):
+        """Nothing to clean up without a browser"""
+    
+    @staticmethod
+    def _build_session(pool_size, retries):
+        """requests.Session with keep-alive connection pooling and retries"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        retry = Retry(total=retries, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest',
+        })
+        return session
+    
+    def _get_json(self, endpoint, **params):
+        """GET one of the plot finder endpoints and return the decoded JSON"""
+        path = self.endpoints[endpoint].format(**{k: quote(str(v), safe='') for k, v in params.items()})
+        response = self._shared['session'].get(self.api_base + path, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def _lookup_via_http(self, column_b_value, column_a_value):
+        """Resolve area -> plot -> coordinates through the JSON endpoints"""
+        area_key = (self.city, AreaIndex.normalize(column_b_value))
+        area_id = self._shared['area_ids'].get(area_key)
+        if area_id is None:
+            area = _first_result(self._get_json('area_search', city=self.city, query=column_b_value))
+            if area is None or area.get('id') is None:
+                raise Exception(f"No area suggestion for Column B: {column_b_value}")
+            area_id = area['id']
+            self._shared['area_ids'][area_key] = area_id
+        self._check_cancelled()
+        
+        plot = _first_result(self._get_json('plot_search', area_id=area_id, query=column_a_value))
+        if plot is None or plot.get('id') is None:
+            raise Exception(f"No plot suggestion for Column A: {column_a_value}")
+        
+        # Only the plot's own fields count; nested objects (e.g. its area) have other locations
+        lat, lng = _own_coordinates(plot)
+        if lat is None:
+            self._check_cancelled()
+            lat, lng = _own_coordinates(self._get_json('plot_detail', plot_id=plot['id']))
+        if lat is None:
+            raise Exception("No coordinates in plot details")
+        
+        return {
+            'success': True,
+            'latitude': lat,
+            'longitude': lng,
+            'maps_url': f"https://www.google.com/maps?q={lat},{lng}"
+        }
+    
+    def _fallback_browser(self):
+        """This session's Selenium scraper, started the first time a row needs it"""
+        if self._browser is None:
+            print("Starting Chrome for browser fallback...")
+            self._browser = ZameenScraper(
+                headless=self.headless, city=self.city, area_index=self.area_index)
+        return self._browser
+    
+    def scrape_single_location(self, column_b_value, column_a_value):
+        """Scrape coordinates over HTTP, falling back to the browser flow"""
+        print(f"\n=== HTTP lookup: Column B='{column_b_value}', Column A='{column_a_value}' ===")
+        try:
+            result = self._lookup_via_http(column_b_value, column_a_value)
+            print(f"SUCCESS (HTTP): Latitude={result['latitude']}, Longitude={result['longitude']}")
+            return result
+        except Exception as e:
+            error_msg = f"HTTP lookup failed: {e}"
+            print(error_msg)
+        
+        failed = {
+            'success': False,
+            'error': error_msg,
+            'latitude': None,
+            'longitude': None,
+            'maps_url': None
+        }
+        if not self.fallback or (self.cancel_event is not None and self.cancel_event.is_set()):
+            return failed
+        if self._shared['fallback_error'] is not None:
+            failed['error'] += f"; browser fallback unavailable: {self._shared['fallback_error']}"
+            return failed
+        
+        print("Falling back to the browser flow...")
+        try:
+            browser = self._fallback_browser()
+        except Exception as e:
+            print(f"Browser fallback unavailable, continuing with HTTP only: {e}")
+            self._shared['fallback_error'] = str(e)
+            failed['error'] += f"; browser fallback unavailable: {e}"
+            return failed
+        
+        browser.cancel_event = self.cancel_event
+        try:
+            return browser.scrape_single_location(column_b_value, column_a_value)
+        finally:
+            browser.cancel_event = None
+    
+    def close(self):
+        """Close this session's fallback browser, and the connection pool if it owns it"""
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._owns_shared:
+            self._shared['session'].close()
+
+class HedgedScheduler:
+    """Run scrape jobs across several browser sessions with hedged retries
+    
+    Every session scrapes one row at a time. Once enough rows have finished,
+    a row that has been running longer than the hedge_percentile of observed
+    row latency gets a speculative duplicate on an idle session. The first
+    successful attempt wins; the other one is cancelled at its next step and
+    its tabs are cleaned up when it returns. run() only returns once every
+    attempt has stopped, so the sessions can be reused or closed afterwards.
+    """
+    
+    def __init__(self, sessions, hedge_percentile=None, min_samples=10, poll_interval=0.5):
+        self.sessions = list(sessions)
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.poll_interval = poll_interval
+        self.latencies = []
+    
+    def _hedge_threshold(self):
+        """Latency (seconds) after which a running row gets a duplicate attempt"""
+        if self.hedge_percentile is None or len(self.latencies) < self.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        rank = math.ceil(self.hedge_percentile / 100 * len(ordered))
+        return ordered[min(max(rank, 1), len(ordered)) - 1]
+    
+    def run(self, jobs, on_result):
+        """Scrape all jobs, calling on_result(key, result) once per job
+        
+        Args:
+            jobs: Iterable of (key, area, location) tuples
+            on_result: Callback run on the calling thread with the winning result
+        """
+        queue = deque(jobs)
+        idle = deque(self.sessions)
+        running = {}  # future -> (key, session), including cancelled losers
+        active = {}   # key -> attempt state for rows without a result yet
+        
+        executor = ThreadPoolExecutor(max_workers=len(self.sessions))
+        try:
+            def start_attempt(key, session):
+                state = active[key]
+                session.cancel_event = state['cancel']
+                future = executor.submit(session.scrape_single_location, state['area'], state['location'])
+                running[future] = (key, session)
+                state['attempts'] += 1
+            
+            while queue or active:
+                while queue and idle:
+                    key, area, location = queue.popleft()
+                    print(f"Starting row {key + 1}: '{area}' / '{location}'")
+                    active[key] = {
+                        'area': area,
+                        'location': location,
+                        'start': time.time(),
+                        'cancel': threading.Event(),
+                        'attempts': 0,
+                        'hedged': False,
+                    }
+                    start_attempt(key, idle.popleft())
+                
+                threshold = self._hedge_threshold()
+                if threshold is not None and idle:
+                    now = time.time()
+                    for key, state in active.items():
+                        if not idle:
+                            break
+                        elapsed = now - state['start']
+                        if not state['hedged'] and elapsed > threshold:
+                            print(f"Row {key + 1} running for {elapsed:.1f}s "
+                                  f"(p{self.hedge_percentile} = {threshold:.1f}s), starting hedged attempt")
+                            state['hedged'] = True
+                            start_attempt(key, idle.popleft())
+                
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, session = running.pop(future)
+                    session.cancel_event = None
+                    idle.append(session)
+                    
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {
+                            'success': False,
+                            'error': str(e),
+                            'latitude': None,
+                            'longitude': None,
+                            'maps_url': None
+                        }
+                    
+                    state = active.get(key)
+                    if state is None:
+                        # Losing attempt that finished before noticing the cancel
+                        session._cleanup_tabs()
+                        continue
+                    
+                    state['attempts'] -= 1
+                    if not result['success'] and state['attempts'] > 0:
+                        # The other attempt may still succeed
+                        continue
+                    
+                    del active[key]
+                    state['cancel'].set()
+                    self.latencies.append(time.time() - state['start'])
+                    on_result(key, result)
+        finally:
+            # Cancel whatever is still running and wait for it, so no session is
+            # reused or closed while a losing attempt still drives its browser.
+            # Cancelled attempts stop at their next step, within a poll interval.
+            for state in active.values():
+                state['cancel'].set()
+            for future, (key, session) in running.items():
+                try:
+                    future.result()
+                except Exception:
+                    pass
+                session._cleanup_tabs()
+            executor.shutdown(wait=True)
+            for session in self.sessions:
+                session.cancel_event = None
+
+
+def _is_number(value):
+    """True if an Excel cell holds a usable coordinate"""
+    if value is None or isinstance(value, bool):
+        return False
+    try:
+        return not math.isnan(float(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _parse_timestamp(value):
+    """Parse a scrape time written by process_excel_file, or None"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def _sheet_rows(path, has_header=False, max_col=None):
+    """Yield the first sheet's rows as value tuples, using openpyxl's read-only mode
+    
+    max_col (1-based) stops each row at that column, so wide sheets are not read in full.
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(max_col=max_col, values_only=True)
+        if has_header:
+            next(rows, None)
+        yield from rows
+    finally:
+        workbook.close()
+
+
+def plan_excel_file(file_path, area_col="B", location_col="A", lat_col="C", lng_col="D",
+                    output_file=None, has_header=False, incremental=False,
+                    stale_after_days=None, timestamp_col=None, city=DEFAULT_CITY,
+                    area_index=None, workers=1, row_seconds=None, engine="selenium"):
+    """Report what process_excel_file would do, without starting a browser
+    
+    Reads the sheet with openpyxl in read-only mode (no pandas or selenium) and
+    counts rows, empty rows, duplicate pairs, area index hits and an estimate
+    of the wall-clock time.
+    
+    Args:
+        area_index: Optional AreaIndex; rows whose area is indexed skip the first search bar
+        workers: Parallel sessions; a row only gains from an area indexed by another
+            row if that row started at least one round of workers earlier
+        row_seconds: Fixed seconds per row instead of the built-in estimate
+        engine: "selenium" or "http", selects the per-row timing model (the http
+            estimate assumes no row needs the browser fallback)
+    """
+    if stale_after_days is not None and not timestamp_col:
+        raise ValueError("stale_after_days needs timestamp_col to know when rows were scraped")
+    
+    final_output = default_output_file(file_path, output_file)
+    workers = max(workers, 1)
+    
+    area_idx = col_to_index(area_col)
+    location_idx = col_to_index(location_col)
+    lat_idx = col_to_index(lat_col)
+    lng_idx = col_to_index(lng_col)
+    ts_idx = col_to_index(timestamp_col) if timestamp_col else None
+    cutoff = datetime.now() - timedelta(days=stale_after_days) if stale_after_days is not None else None
+    max_col = max(i for i in (area_idx, location_idx, lat_idx, lng_idx, ts_idx) if i is not None) + 1
+    
+    def cell(row, idx):
+        value = row[idx] if row is not None and idx is not None and idx < len(row) else None
+        return "" if value is None else value
+    
+    # Like process_excel_file, reuse the previous output row at the same position
+    # only if it still holds the same area and location
+    previous = []
+    if incremental and os.path.exists(final_output) and os.path.abspath(final_output) != os.path.abspath(file_path):
+        previous = list(_sheet_rows(final_output, has_header, max_col))
+    
+    total = empty = done = 0
+    index_hits = predicted_hits = 0
+    pair_counts = {}
+    first_position = {}  # normalized area -> position among rows to scrape
+    estimated_seconds = 0.0
+    
+    for pos, row in enumerate(_sheet_rows(file_path, has_header, max_col)):
+        total += 1
+        area_val = str(cell(row, area_idx)).strip()
+        location_val = str(cell(row, location_idx)).strip()
+        if not area_val and not location_val:
+            empty += 1
+            continue
+        
+        pair = (AreaIndex.normalize(area_val), AreaIndex.normalize(location_val))
+        pair_counts[pair] = pair_counts.get(pair, 0) + 1
+        
+        if incremental:
+            output_row = row
+            if previous:
+                # Same row-matching rule as process_excel_file
+                output_row = previous[pos] if pos < len(previous) else None
+                if (_cell_key(cell(output_row, area_idx)) != _cell_key(area_val) or
+                        _cell_key(cell(output_row, location_idx)) != _cell_key(location_val)):
+                    output_row = None
+            if _is_number(cell(output_row, lat_idx)) and _is_number(cell(output_row, lng_idx)):
+                scraped_at = _parse_timestamp(cell(output_row, ts_idx)) if ts_idx is not None else None
+                if cutoff is None or ts_idx is None or (scraped_at is not None and scraped_at >= cutoff):
+                    done += 1
+                    continue
+        
+        # Position of this row in the scrape order and whether its area was
+        # started early enough (a full round of workers before) to be indexed by now
+        order = total - empty - done - 1
+        first = first_position.setdefault(pair[0], order)
+        earlier_row_done = first <= order - workers
+        
+        if engine == "http":
+            # The HTTP engine caches area ids in memory instead of using the index
+            requests_needed = HTTP_REQUESTS_PER_ROW + (0 if earlier_row_done else 1)
+            row_cost = HTTP_REQUEST_SECONDS * requests_needed
+        else:
+            indexed = False
+            if area_index is not None:
+                if area_index.get(city, area_val) is not None:
+                    index_hits += 1
+                    indexed = True
+                elif earlier_row_done and not area_index.blocked(city, area_val):
+                    predicted_hits += 1
+                    indexed = True
+            row_cost = (ROW_OVERHEAD_SECONDS + SUGGESTION_WAIT_SECONDS +
+                        TYPING_SECONDS_PER_CHAR * len(location_val))
+            if not indexed:
+                row_cost += SUGGESTION_WAIT_SECONDS + TYPING_SECONDS_PER_CHAR * len(area_val)
+        
+        estimated_seconds += row_seconds if row_seconds is not None else row_cost
+    
+    to_scrape = total - empty - done
+    duplicate_pairs = sum(1 for count in pair_counts.values() if count > 1)
+    duplicate_rows = sum(count - 1 for count in pair_counts.values() if count > 1)
+    wall_clock = estimated_seconds / workers
+    
+    print(f"Plan for: {file_path}" + (f" (merged with {final_output})" if previous else ""))
+    print(f"Total rows: {total}")
+    print(f"Empty rows: {empty}")
+    if incremental:
+        print(f"Already done: {done}")
+    print(f"Rows to scrape: {to_scrape}")
+    print(f"Duplicate pairs: {duplicate_pairs} ({duplicate_rows} extra rows)")
+    if area_index is not None and engine != "http":
+        print(f"Area index hits: {index_hits} of {to_scrape} rows already indexed")
+        print(f"Predicted index hits: {predicted_hits} more rows, indexed by an earlier row of this run")
+    print(f"Estimated wall-clock time: {timedelta(seconds=round(wall_clock))} "
+          f"with {workers} worker(s), {engine} engine")
+    
+    return {
+        'source_file': file_path,
+        'total_rows': total,
+        'empty_rows': empty,
+        'done_rows': done,
+        'rows_to_scrape': to_scrape,
+        'duplicate_pairs': duplicate_pairs,
+        'duplicate_rows': duplicate_rows,
+        'index_hits': index_hits,
+        'predicted_index_hits': predicted_hits,
+        'estimated_seconds': wall_clock,
+    }
+
+
+COMMANDS = ("scrape", "plan", "reextract")
+
+
+def build_parser():
+    """Build the command line parser"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("file", nargs="?", default="zameen.xlsx",
+                        help="Excel file with locations (default: %(default)s)")
+    common.add_argument("--area-col", default="B",
+                        help="Column with area/society names, typed in the FIRST search bar (default: %(default)s)")
+    common.add_argument("--location-col", default="A",
+                        help="Column with specific locations, typed in the SECOND search bar (default: %(default)s)")
+    common.add_argument("--lat-col", default="C", help="Where to write latitude (default: %(default)s)")
+    common.add_argument("--lng-col", default="D", help="Where to write longitude (default: %(default)s)")
+    common.add_argument("--url-col", default="E", help="Where to write the Google Maps URL (default: %(default)s)")
+    common.add_argument("--output", default="addresses_with_coordinates.xlsx",
+                        help="Output Excel file (default: %(default)s)")
+    common.add_argument("--header", action="store_true", help="First row contains headers")
+    common.add_argument("--city", default=DEFAULT_CITY,
+                        help="Plot finder city path, e.g. Karachi-30 or Lahore-1 (default: %(default)s)")
+    common.add_argument("--area-index", default="area_index.json",
+                        help="Cache of area -> plot finder URL (default: %(default)s)")
+    common.add_argument("--no-area-index", dest="area_index", action="store_const", const=None,
+                        help="Do not use the area index")
+    common.add_argument("--incremental", action="store_true",
+                        help="Only scrape rows missing, failed or stale in the existing output file")
+    common.add_argument("--stale-after-days", type=float,
+                        help="With --incremental, re-scrape rows older than this many days")
+    common.add_argument("--timestamp-col",
+                        help="Where to write the scrape time, e.g. F (needed for --stale-after-days)")
+    common.add_argument("--workers", type=int, default=1,
+                        help="Number of browser sessions scraping in parallel (default: %(default)s)")
+    common.add_argument("--engine", choices=("selenium", "http"), default="selenium",
+                        help="selenium drives Chrome; http (EXPERIMENTAL, unconfirmed endpoints) calls "
+                             "the plot finder's JSON endpoints and uses Chrome only for rows it cannot "
+                             "resolve (default: %(default)s)")
+    common.add_argument("--row-seconds", type=float,
+                        help="Planner: fixed seconds per row instead of the built-in estimate")
+    
+    parser = argparse.ArgumentParser(
+        description="Find plot coordinates with the Zameen plot finder",
+        epilog="Without a command, 'scrape' is used.")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    scrape = subparsers.add_parser("scrape", parents=[common], help="Scrape coordinates for every row")
+    scrape.add_argument("--headless", action="store_true", help="Run without showing the browser window")
+    scrape.add_argument("--api-base", default=HTTP_API_BASE,
+                        help="Base URL for the http engine's endpoints (default: %(default)s)")
+    scrape.add_argument("--no-fallback", dest="fallback", action="store_false",
+                        help="With --engine http, never start Chrome for failed rows")
+    scrape.add_argument("--hedge-percentile", type=float,
+                        help="With --workers > 1, e.g. 95 to hedge rows slower than p95")
+    scrape.add_argument("--dry-run", action="store_true", help="Print the plan without starting Chrome")
+    
+    subparsers.add_parser("plan", parents=[common],
+                          help="Report row counts, duplicates, index hits and estimated time without Chrome")
+    
+    reextract = subparsers.add_parser("reextract",
+                                      help="Re-derive lat/lng from the stored Google Maps URLs without Chrome")
+    reextract.add_argument("file", help="Excel file with stored Google Maps URLs")
+    reextract.add_argument("--lat-col", default="C", help="Where to write latitude (default: %(default)s)")
+    reextract.add_argument("--lng-col", default="D", help="Where to write longitude (default: %(default)s)")
+    reextract.add_argument("--url-col", default="E", help="Column with Google Maps URLs (default: %(default)s)")
+    reextract.add_argument("--output", help="Output Excel file (default: <file>_reextracted.xlsx)")
+    reextract.add_argument("--header", action="store_true", help="First row contains headers")
+    return parser
+
+
+def main(argv=None):
+    """Command line entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["scrape"] + list(argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.command != "reextract" and args.stale_after_days is not None and not args.timestamp_col:
+        parser.error("--stale-after-days needs --timestamp-col to know when rows were scraped")
     
     # Check if file exists
-    if not os.path.exists(EXCEL_FILE_PATH):
-        print(f"ERROR: Excel file not found at: {EXCEL_FILE_PATH}")
-        print("Please update the EXCEL_FILE_PATH variable with the correct path.")
+    if not os.path.exists(args.file):
+        parser.error(f"Excel file not found at: {args.file} "
+                     f"(pass the path of your Excel file, e.g. python scrapper.py scrape zameen.xlsx)")
+    
+    if args.command == "reextract":
+        reextract_excel_file(
+            args.file,
+            lat_col=args.lat_col,
+            lng_col=args.lng_col,
+            url_col=args.url_col,
+            output_file=args.output,
+            has_header=args.header
+        )
+        return
+    
+    area_index = AreaIndex(args.area_index) if args.area_index else None
+    
+    if args.command == "plan" or args.dry_run:
+        plan_excel_file(
+            args.file,
+            area_col=args.area_col,
+            location_col=args.location_col,
+            lat_col=args.lat_col,
+            lng_col=args.lng_col,
+            output_file=args.output,
+            has_header=args.header,
+            incremental=args.incremental,
+            stale_after_days=args.stale_after_days,
+            timestamp_col=args.timestamp_col,
+            city=args.city,
+            area_index=area_index,
+            workers=args.workers,
+            row_seconds=args.row_seconds,
+            engine=args.engine
+        )
         return
     
     scraper = None
     try:
         print("Starting Zameen Property Scraper...")
-        print(f"Excel file: {EXCEL_FILE_PATH}")
-        print(f"Column B (First search): {AREA_COLUMN}, Column A (Second search): {LOCATION_COLUMN}")
-        print(f"Output columns: Lat={LAT_OUTPUT_COLUMN}, Lng={LNG_OUTPUT_COLUMN}, URL={URL_OUTPUT_COLUMN}")
+        print(f"Excel file: {args.file}")
+        print(f"Plot finder: {PLOTFINDER_URL.format(city=args.city)} (engine: {args.engine})")
+        print(f"Column B (First search): {args.area_col}, Column A (Second search): {args.location_col}")
+        print(f"Output columns: Lat={args.lat_col}, Lng={args.lng_col}, URL={args.url_col}")
         print(f"Search sequence: Column B -> First search bar -> Column A -> Second search bar")
         print("NOTE: The script will ALWAYS click the FIRST suggestion that appears, regardless of its content")
         
         # Initialize scraper
-        scraper = ZameenScraper(headless=HEADLESS_MODE)
+        if args.engine == "http":
+            print("WARNING: The http engine is experimental; its JSON endpoints have not been "
+                  "confirmed against the live site (see HTTP_ENDPOINTS)")
+            scraper = ZameenHttpScraper(headless=args.headless, city=args.city, area_index=area_index,
+                                        api_base=args.api_base, pool_size=max(args.workers, 1),
+                                        fallback=args.fallback)
+        else:
+            scraper = ZameenScraper(headless=args.headless, city=args.city, area_index=area_index)
         
         # Process the Excel file
         results = scraper.process_excel_file(
-            file_path=EXCEL_FILE_PATH,
-            area_col=AREA_COLUMN,
-            location_col=LOCATION_COLUMN,
-            lat_col=LAT_OUTPUT_COLUMN,
-            lng_col=LNG_OUTPUT_COLUMN,
-            url_col=URL_OUTPUT_COLUMN,
-            output_file=OUTPUT_FILE,
-            has_header=HAS_HEADER
+            file_path=args.file,
+            area_col=args.area_col,
+            location_col=args.location_col,
+            lat_col=args.lat_col,
+            lng_col=args.lng_col,
+            url_col=args.url_col,
+            output_file=args.output,
+            has_header=args.header,
+            incremental=args.incremental,
+            stale_after_days=args.stale_after_days,
+            timestamp_col=args.timestamp_col,
+            workers=args.workers,
+            hedge_percentile=args.hedge_percentile
         )
         
         print("\nScraping completed successfully!")
@@ -750,17 +1770,24 @@ if __name__ == "__main__":
 INSTALLATION REQUIREMENTS:
 
 1. Install required packages:
-   pip install selenium pandas openpyxl beautifulsoup4
+   pip install selenium pandas openpyxl requests
 
 2. Install ChromeDriver:
    - Download from: https://chromedriver.chromium.org/
    - Make sure it matches your Chrome version
    - Add to system PATH or place in script directory
 
-3. Update the configuration in main() function:
-   - EXCEL_FILE_PATH: Path to your Excel file
-   - Column letters for input and output
-   - Set HAS_HEADER=True if first row contains headers
+3. Run from the command line (see python scrapper.py --help):
+   python scrapper.py plan zameen.xlsx --workers 4    # Dry run, no Chrome
+   python scrapper.py scrape zameen.xlsx --header     # First row contains headers
+   python scrapper.py scrape zameen.xlsx --engine http --workers 8   # Experimental: JSON endpoints, Chrome as fallback
+   python scrapper.py reextract addresses_with_coordinates.xlsx   # Re-parse stored URLs
+   - Column letters for input and output: --area-col, --location-col, --lat-col, ...
+
+4. Tests and benchmarks (no Chrome or network needed):
+   pip install pytest
+   python -m pytest -q tests
+   python benchmarks/bench_extract_coordinates.py
 
 FEATURES:
 [+] SIMPLIFIED: Always clicks the FIRST suggestion that appears
@@ -768,8 +1795,13 @@ FEATURES:
 [+] Improved element finding with multiple strategies
 [+] Better error handling and debugging
 [+] Progress saving every 5 rows
+[+] Incremental mode: re-runs only scrape missing, failed or stale rows
+[+] Parallel browser sessions with hedged duplicate attempts for slow rows
+[+] Area index: repeat areas open their map view directly, skipping the first search bar
+[+] Command line with a fast dry-run planner (row counts, duplicates, estimated time)
+[+] Experimental browserless HTTP engine with Selenium fallback (endpoints unconfirmed)
 [+] Screenshots for debugging
-[+] More robust coordinate extraction
+[+] More robust coordinate extraction, also in bulk from stored URLs (reextract)
 [+] Detailed logging and status messages
 [+] Fallback strategies for different scenarios
 [+] Support for various Zameen page layouts
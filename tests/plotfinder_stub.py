@@ -0,0 +1,51 @@
+"""Local HTTP server serving synthetic plot finder responses
+
+The responses are hand-written to match the shape ZameenHttpScraper expects;
+they are not captures of the live site.
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSES_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "plotfinder", "synthetic_responses.json")
+
+
+class PlotFinderStub:
+    """Serve synthetic_responses.json on 127.0.0.1; unknown requests get a 404
+    
+    Use as a context manager; `url` is the base to pass as api_base and
+    `requests` lists every path+query received.
+    """
+    
+    def __init__(self, responses_file=RESPONSES_FILE):
+        with open(responses_file, encoding="utf-8") as f:
+            self.responses = {entry["request"]: entry for entry in json.load(f)}
+        self.requests = []
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                stub.requests.append(self.path)
+                entry = stub.responses.get(self.path)
+                status = entry["status"] if entry else 404
+                body = json.dumps(entry["body"] if entry else {"error": "no synthetic response"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+    
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
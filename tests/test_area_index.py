@@ -0,0 +1,78 @@
+"""AreaIndex failure counting and expiry"""
+import json
+
+import scrapper
+
+CITY = "Karachi-30"
+URL = "https://www.zameen.com/plotfinder/Karachi-30/area"
+
+
+def make_index(tmp_path, **kwargs):
+    return scrapper.AreaIndex(str(tmp_path / "area_index.json"), **kwargs)
+
+
+def test_single_failure_is_indexed_again(tmp_path):
+    index = make_index(tmp_path)
+    index.add(CITY, "DHA  Phase 1", URL)
+    assert index.get(CITY, "dha phase 1") == URL
+    
+    index.remove(CITY, "DHA Phase 1")
+    assert index.get(CITY, "DHA Phase 1") is None
+    assert not index.blocked(CITY, "DHA Phase 1")
+    
+    index.add(CITY, "DHA Phase 1", URL)
+    assert index.get(CITY, "DHA Phase 1") == URL
+
+
+def test_repeated_failures_block_the_area(tmp_path):
+    index = make_index(tmp_path, max_failures=2)
+    for _ in range(2):
+        index.add(CITY, "Clifton", URL)
+        index.remove(CITY, "Clifton")
+    assert index.blocked(CITY, "Clifton")
+    
+    index.add(CITY, "Clifton", URL)
+    assert index.get(CITY, "Clifton") is None
+    assert len(index) == 0
+
+
+def test_block_expires(tmp_path):
+    index = make_index(tmp_path, max_failures=1, retry_after_days=7)
+    index.remove(CITY, "Clifton")
+    assert index.blocked(CITY, "Clifton")
+    
+    index.entries[CITY]["clifton"]["last_failure"] = "2020-01-01 00:00:00"
+    assert not index.blocked(CITY, "Clifton")
+    index.add(CITY, "Clifton", URL)
+    assert index.get(CITY, "Clifton") == URL
+
+
+def test_old_failures_are_forgotten(tmp_path):
+    index = make_index(tmp_path, max_failures=2)
+    index.remove(CITY, "Clifton")
+    index.entries[CITY]["clifton"]["last_failure"] = "2020-01-01 00:00:00"
+    index.remove(CITY, "Clifton")
+    assert index.entries[CITY]["clifton"]["failures"] == 1
+    assert not index.blocked(CITY, "Clifton")
+
+
+def test_saved_and_reloaded(tmp_path):
+    index = make_index(tmp_path, max_failures=1)
+    index.add(CITY, "DHA Phase 1", URL)
+    index.remove(CITY, "Clifton")
+    
+    reloaded = make_index(tmp_path, max_failures=1)
+    assert reloaded.get(CITY, "DHA Phase 1") == URL
+    assert reloaded.blocked(CITY, "Clifton")
+    assert len(reloaded) == 1
+
+
+def test_loads_url_or_null_format(tmp_path):
+    path = tmp_path / "area_index.json"
+    path.write_text(json.dumps({CITY: {"dha phase 1": URL, "clifton": None}}))
+    index = scrapper.AreaIndex(str(path))
+    assert index.get(CITY, "DHA Phase 1") == URL
+    assert index.get(CITY, "Clifton") is None
+    assert not index.blocked(CITY, "Clifton")
+    index.add(CITY, "Clifton", URL)
+    assert index.get(CITY, "Clifton") == URL
@@ -0,0 +1,100 @@
+"""extract_coordinates / extract_coordinates_series against known coordinates"""
+import math
+import os
+import random
+
+import pandas as pd
+import pytest
+
+import scrapper
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "maps_urls.txt")
+
+
+def load_corpus():
+    """(url, (lat, lng)) pairs; (None, None) where the URL holds no coordinates"""
+    corpus = []
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            url, lat, lng = line.rstrip("\n").split("\t")
+            corpus.append((url, (None, None) if lat == "-" else (float(lat), float(lng))))
+    return corpus
+
+
+# One template per entry of COORDINATE_FORMATS, in the same order of preference
+FORMAT_TEMPLATES = [
+    "/@{lat},{lng},15z",
+    "/data=!3m1!1s0x0:0x0!3d{lat}!4d{lng}",
+    "?api=1&destination={lat}{sep}{lng}",
+    "?q={lat}{sep}{lng}",
+    "/place/{lat},{lng}",
+    "?ll={lat},{lng}",
+]
+
+
+def fuzz_corpus(count=5000, seed=7):
+    """Random URLs built from known coordinates, as (url, expected) pairs
+    
+    Each URL holds one or two formats; the expected value is the most
+    preferred format with in-range coordinates, or (None, None) if none is.
+    """
+    rng = random.Random(seed)
+    
+    def number(low, high):
+        return f"{rng.uniform(low, high):.{rng.randint(1, 7)}f}"
+    
+    def part(fmt, valid):
+        lat = number(-90, 90) if valid else number(90.5, 200) if rng.random() < 0.5 else number(-200, -90.5)
+        lng = number(-180, 180)
+        text = FORMAT_TEMPLATES[fmt].format(lat=lat, lng=lng, sep=rng.choice([",", "%2C", "%2c"]))
+        return text, ((float(lat), float(lng)) if valid else None)
+    
+    corpus = []
+    for _ in range(count):
+        formats = sorted(rng.sample(range(len(FORMAT_TEMPLATES)), rng.randint(1, 2)))
+        parts = [part(fmt, rng.random() < 0.7) for fmt in formats]
+        expected = next((coords for _, coords in parts if coords is not None), (None, None))
+        texts = [text for text, _ in parts]
+        rng.shuffle(texts)
+        corpus.append(("https://www.google.com/maps" + "".join(texts), expected))
+    return corpus
+
+
+def same(expected, actual):
+    if expected == (None, None):
+        return all(value is None or (isinstance(value, float) and math.isnan(value)) for value in actual)
+    return tuple(actual) == expected
+
+
+@pytest.mark.parametrize("url,expected", load_corpus())
+def test_corpus(url, expected):
+    assert scrapper.extract_coordinates(url) == expected
+
+
+def test_fuzzed_urls():
+    for url, expected in fuzz_corpus():
+        assert scrapper.extract_coordinates(url) == expected, url
+
+
+def test_series():
+    corpus = load_corpus() + fuzz_corpus(count=2000, seed=11)
+    special = [None, float("nan"), 157, 24.9, pd.NA, "", "N/A"]
+    cells = [url for url, _ in corpus] + special
+    expected = [coords for _, coords in corpus] + [(None, None)] * len(special)
+    series = pd.Series(cells, index=range(100, 100 + len(cells)))
+    
+    coords = scrapper.extract_coordinates_series(series)
+    
+    assert list(coords.columns) == ["latitude", "longitude"]
+    assert list(coords.index) == list(series.index)
+    for (_, row), cell, coords_expected in zip(coords.iterrows(), cells, expected):
+        assert same(coords_expected, (row["latitude"], row["longitude"])), cell
+
+
+def test_series_handles_repeated_urls():
+    url = "https://www.google.com/maps/@24.9372148,67.0429563,17z"
+    coords = scrapper.extract_coordinates_series([url, url, None, url])
+    assert coords["latitude"].tolist()[:2] == [24.9372148, 24.9372148]
+    assert math.isnan(coords["latitude"][2])
@@ -0,0 +1,155 @@
+"""HedgedScheduler with fake sessions standing in for browsers"""
+import threading
+import time
+
+import scrapper
+
+
+class Script:
+    """Per-area attempts, each a (seconds, success) pair, handed out in start order"""
+    
+    def __init__(self, attempts, default=(0.02, True)):
+        self.attempts = {area: list(steps) for area, steps in attempts.items()}
+        self.default = default
+        self.lock = threading.Lock()
+    
+    def next(self, area):
+        with self.lock:
+            steps = self.attempts.get(area)
+            return steps.pop(0) if steps else self.default
+
+
+class FakeSession:
+    """Sleeps like a scrape, checking cancel_event the way ZameenScraper does"""
+    
+    def __init__(self, name, script):
+        self.name = name
+        self.script = script
+        self.cancel_event = None
+        self.calls = []
+        self.cancelled = []
+        self.cleanups = 0
+        self.running = 0
+    
+    def scrape_single_location(self, area, location):
+        seconds, success = self.script.next(area)
+        self.calls.append(area)
+        self.running += 1
+        try:
+            deadline = time.time() + seconds
+            while time.time() < deadline:
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    self.cancelled.append(area)
+                    raise scrapper.ScrapeCancelled("Cancelled by a hedged attempt")
+                time.sleep(0.005)
+            return {
+                'success': success,
+                'latitude': 1.0 if success else None,
+                'longitude': 2.0 if success else None,
+                'maps_url': self.name if success else None,
+                'error': None if success else "not found",
+            }
+        finally:
+            self.running -= 1
+    
+    def _cleanup_tabs(self):
+        self.cleanups += 1
+
+
+def run(sessions, areas, **kwargs):
+    kwargs.setdefault("poll_interval", 0.01)
+    scheduler = scrapper.HedgedScheduler(sessions, **kwargs)
+    results = {}
+    
+    def on_result(key, result):
+        assert key not in results
+        results[key] = result
+    
+    scheduler.run([(i, area, "loc") for i, area in enumerate(areas)], on_result)
+    return results
+
+
+def calls(sessions, area):
+    return sum(session.calls.count(area) for session in sessions)
+
+
+def cancelled(sessions, area):
+    return sum(session.cancelled.count(area) for session in sessions)
+
+
+QUICK = ["q1", "q2", "q3", "q4"]
+
+
+def test_every_job_gets_one_result_without_hedging():
+    script = Script({})
+    sessions = [FakeSession(f"s{i}", script) for i in range(3)]
+    results = run(sessions, QUICK + ["q5", "q6"])
+    assert sorted(results) == list(range(6))
+    assert all(result['success'] for result in results.values())
+    assert sum(len(session.calls) for session in sessions) == 6
+
+
+def test_no_hedge_before_min_samples():
+    script = Script({"slow": [(0.3, True)]})
+    sessions = [FakeSession(f"s{i}", script) for i in range(2)]
+    results = run(sessions, ["slow"] + QUICK, hedge_percentile=50, min_samples=10)
+    assert results[0]['success']
+    assert calls(sessions, "slow") == 1
+
+
+def test_hedge_starts_after_percentile_and_first_success_wins():
+    script = Script({"slow": [(5, True), (0.02, True)]})
+    sessions = [FakeSession(f"s{i}", script) for i in range(2)]
+    started = time.time()
+    results = run(sessions, QUICK + ["slow"], hedge_percentile=50, min_samples=4)
+    
+    assert time.time() - started < 2
+    assert results[4]['success']
+    assert calls(sessions, "slow") == 2
+    # The slow first attempt lost and was cancelled
+    assert cancelled(sessions, "slow") == 1
+
+
+def test_failure_does_not_decide_while_other_attempt_runs():
+    script = Script({"slow": [(0.5, True), (0.02, False)]})
+    sessions = [FakeSession(f"s{i}", script) for i in range(2)]
+    results = run(sessions, QUICK + ["slow"], hedge_percentile=50, min_samples=4)
+    
+    assert calls(sessions, "slow") == 2
+    assert results[4]['success']
+    assert cancelled(sessions, "slow") == 0
+
+
+def test_both_attempts_failing_reports_one_failure():
+    script = Script({"slow": [(0.3, False), (0.02, False)]})
+    sessions = [FakeSession(f"s{i}", script) for i in range(2)]
+    results = run(sessions, QUICK + ["slow"], hedge_percentile=50, min_samples=4)
+    
+    assert calls(sessions, "slow") == 2
+    assert not results[4]['success']
+
+
+def test_exception_becomes_failed_result():
+    class Broken(FakeSession):
+        def scrape_single_location(self, area, location):
+            raise RuntimeError("browser died")
+    
+    results = run([Broken("s0", Script({}))], ["q1"])
+    assert results[0]['success'] is False
+    assert results[0]['error'] == "browser died"
+
+
+def test_sessions_are_idle_and_reusable_after_run():
+    script = Script({"slow": [(5, True), (0.02, True)]})
+    sessions = [FakeSession(f"s{i}", script) for i in range(2)]
+    run(sessions, QUICK + ["slow"], hedge_percentile=50, min_samples=4)
+    
+    # The losing attempt has stopped and cleaned up before run() returned
+    assert all(session.running == 0 for session in sessions)
+    assert all(session.cancel_event is None for session in sessions)
+    loser = next(session for session in sessions if "slow" in session.cancelled)
+    assert loser.cleanups >= 1
+    
+    # Reused afterwards (e.g. a workers=1 run on the same scraper) nothing is cancelled
+    for session in sessions:
+        assert session.scrape_single_location("again", "loc")['success']
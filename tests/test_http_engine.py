@@ -0,0 +1,132 @@
+"""ZameenHttpScraper against a stub server serving synthetic plot finder responses
+
+These check the engine's own logic (parsing, caching, retries, fallback), not
+that the guessed endpoints match the live site.
+"""
+import pandas as pd
+import pytest
+
+import scrapper
+from plotfinder_stub import PlotFinderStub
+
+AREA = "North Nazimabad Block I"
+
+
+@pytest.fixture
+def stub():
+    with PlotFinderStub() as server:
+        yield server
+
+
+@pytest.fixture
+def make_scraper(stub):
+    scrapers = []
+    
+    def make(**kwargs):
+        kwargs.setdefault("fallback", False)
+        scraper = scrapper.ZameenHttpScraper(api_base=stub.url, retries=0, **kwargs)
+        scrapers.append(scraper)
+        return scraper
+    
+    yield make
+    for scraper in scrapers:
+        scraper.close()
+
+
+class FakeBrowser:
+    """Stands in for the Selenium fallback"""
+    
+    def __init__(self, *args, **kwargs):
+        self.cancel_event = None
+        self.closed = False
+    
+    def scrape_single_location(self, column_b_value, column_a_value):
+        return {'success': True, 'latitude': 1.0, 'longitude': 2.0, 'maps_url': 'browser'}
+    
+    def close(self):
+        self.closed = True
+
+
+def test_plot_with_own_coordinates_needs_no_detail_request(stub, make_scraper):
+    result = make_scraper().scrape_single_location(AREA, "B157")
+    
+    assert result['success']
+    assert (result['latitude'], result['longitude']) == (24.9372148, 67.0429563)
+    assert not any(path.startswith("/api/plotFinder/plot/") for path in stub.requests)
+
+
+def test_nested_area_location_is_not_taken_as_plot_coordinates(stub, make_scraper):
+    result = make_scraper().scrape_single_location(AREA, "B568")
+    
+    assert (result['latitude'], result['longitude']) == (24.95, 67.05)
+    assert "/api/plotFinder/plot/880568/" in stub.requests
+
+
+def test_null_coordinates_fall_through_to_plot_detail(make_scraper):
+    result = make_scraper().scrape_single_location(AREA, "B158")
+    assert (result['latitude'], result['longitude']) == (24.9381, 67.0436)
+
+
+def test_area_id_is_looked_up_once_per_area(stub, make_scraper):
+    scraper = make_scraper()
+    scraper.scrape_single_location(AREA, "B157")
+    scraper._spawn_session().scrape_single_location(AREA, "B158")
+    
+    assert sum(path.startswith("/api/plotFinder/search/") for path in stub.requests) == 1
+
+
+@pytest.mark.parametrize("area, location", [(AREA, "B56"), ("Unknown Society", "B1")])
+def test_unresolved_rows_fail_without_fallback(make_scraper, area, location):
+    result = make_scraper().scrape_single_location(area, location)
+    assert not result['success']
+    assert result['latitude'] is None
+
+
+def test_unresolved_rows_use_the_browser_fallback(make_scraper, monkeypatch):
+    monkeypatch.setattr(scrapper, "ZameenScraper", FakeBrowser)
+    result = make_scraper(fallback=True).scrape_single_location(AREA, "B56")
+    assert result['maps_url'] == 'browser'
+
+
+def test_each_worker_gets_its_own_fallback_browser(make_scraper, monkeypatch):
+    monkeypatch.setattr(scrapper, "ZameenScraper", FakeBrowser)
+    scraper = make_scraper(fallback=True)
+    worker = scraper._spawn_session()
+    
+    first, second = scraper._fallback_browser(), worker._fallback_browser()
+    assert first is not second
+    
+    worker.close()
+    assert second.closed and not first.closed
+
+
+def test_fallback_start_failure_fails_the_row_and_is_not_retried(make_scraper, monkeypatch):
+    starts = []
+    
+    def broken_chrome(*args, **kwargs):
+        starts.append(1)
+        raise Exception("chromedriver not found")
+    
+    monkeypatch.setattr(scrapper, "ZameenScraper", broken_chrome)
+    scraper = make_scraper(fallback=True)
+    worker = scraper._spawn_session()
+    
+    first = scraper.scrape_single_location(AREA, "B56")
+    second = worker.scrape_single_location("Unknown Society", "B1")
+    
+    assert not first['success'] and "chromedriver not found" in first['error']
+    assert not second['success'] and "fallback unavailable" in second['error']
+    assert len(starts) == 1
+
+
+def test_process_excel_file_with_parallel_workers(make_scraper, tmp_path):
+    input_file = tmp_path / "plots.xlsx"
+    output_file = tmp_path / "plots_out.xlsx"
+    pd.DataFrame([["B157", AREA], ["B568", AREA], ["B56", AREA], ["B158", AREA]]).to_excel(
+        input_file, index=False, header=False)
+    
+    make_scraper().process_excel_file(str(input_file), output_file=str(output_file), workers=2)
+    
+    out = pd.read_excel(output_file, header=None)
+    assert out.iloc[:, 2].tolist() == [24.9372148, 24.95, "Location not found", 24.9381]
+    assert out.iloc[:, 3].tolist() == [67.0429563, 67.05, "Location not found", 67.0436]
@@ -0,0 +1,42 @@
+"""plan_excel_file predictions and command line errors"""
+import pandas as pd
+import pytest
+
+import scrapper
+
+CITY = "Karachi-30"
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    path = tmp_path / "zameen.xlsx"
+    pd.DataFrame([["Block 1", "DHA"], ["Block 2", "DHA"], ["Block 3", "Clifton"]]).to_excel(
+        path, header=False, index=False)
+    return str(path)
+
+
+def test_repeat_area_is_a_predicted_hit(sheet, tmp_path):
+    index = scrapper.AreaIndex(str(tmp_path / "area_index.json"))
+    summary = scrapper.plan_excel_file(sheet, area_index=index)
+    assert summary['index_hits'] == 0
+    assert summary['predicted_index_hits'] == 1
+
+
+def test_blocked_area_is_not_predicted(sheet, tmp_path):
+    index = scrapper.AreaIndex(str(tmp_path / "area_index.json"), max_failures=1)
+    index.remove(CITY, "DHA")
+    summary = scrapper.plan_excel_file(sheet, area_index=index)
+    assert summary['predicted_index_hits'] == 0
+
+
+def test_missing_file_exits_with_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        scrapper.main(["plan", str(tmp_path / "missing.xlsx")])
+    assert exc.value.code != 0
+    assert "not found" in capsys.readouterr().err
+
+
+def test_stale_after_days_needs_timestamp_col(sheet):
+    with pytest.raises(SystemExit) as exc:
+        scrapper.main(["plan", sheet, "--incremental", "--stale-after-days", "3"])
+    assert exc.value.code != 0